@@ -1,30 +1,40 @@
 #!/usr/bin/env python3
 # app_readiness_dashboard.py
 
+import hashlib
 import io
+import json
 import re
+import shutil
+import time
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
-import plotly.express as px
-import requests
 import streamlit as st
 
+def _px():
+    # Deferred: plotly.express is a heavy import that isn't needed until a
+    # chart actually renders (e.g. not at all when the OMB fetch fails).
+    # Python caches the module, so the cost is paid once, on first use.
+    import plotly.express as px
+    return px
+
+def _go():
+    # graph_objects skips plotly.express's DataFrame copy/validation layer;
+    # used for the hot charts that take raw numpy arrays
+    import plotly.graph_objects as go
+    return go
+
 # ---- Page config (ONLY once) ----
 APP_TITLE = "🛡️ Military Readiness Dashboard (Budget • Deployments • Installations)"
 st.set_page_config(page_title="Military Readiness Dashboard", page_icon="🛡️", layout="wide")
 st.title(APP_TITLE)
 st.caption("Prototype • Upload DMDC deployments & base lists • Plot budgets from OMB and public APIs")
 
-# ---- Optional ISO mapping for uploads ----
-try:
-    import pycountry
-    HAVE_PYCOUNTRY = True
-except Exception:
-    HAVE_PYCOUNTRY = False
-
 # ---- Data sources (World Bank / UNPK / USAspending) ----
-from data_sources import REGISTRY, load_selected
+# SESSION is the shared (disk-cached, keep-alive) HTTP session
+from data_sources import REGISTRY, SESSION, load_selected
 
 with st.sidebar:
     st.header("Data sources")
@@ -53,6 +63,20 @@ df = load_selected(choices)
 st.subheader("Combined dataset (preview)")
 st.caption("This table mixes rows from all selected sources. Use the filter to focus it.")
 
+@st.cache_data(show_spinner=False)
+def _preview_sample(df: pd.DataFrame, src: str, cols: tuple[str, ...], n: int) -> pd.DataFrame:
+    # memoized so unrelated widget interactions don't resample the big frame
+    sub = df if src == "All" else df[df["source"] == src]
+    n = min(n, len(sub))
+    sub = sub.sample(n, random_state=42) if n else sub.head(0)
+    sub = sub[list(cols)]
+    # string dtype serializes through Streamlit's Arrow backend without the
+    # object-dtype fallback path (categoricals already dictionary-encode)
+    obj_cols = sub.columns[sub.dtypes.eq(object)]
+    if len(obj_cols):
+        sub = sub.astype({c: "string" for c in obj_cols})
+    return sub
+
 src_options = ["All"] + sorted(df["source"].dropna().unique().tolist())
 src_pick = st.selectbox(
     "Filter preview by source",
@@ -60,15 +84,10 @@ src_pick = st.selectbox(
     index=0,
     key="preview_source",   # unique key avoids duplicate-ID errors
 )
-preview_df = df if src_pick == "All" else df[df["source"] == src_pick]
-
-show_cols = [c for c in ["source", "country", "year", "metric", "value", "unit"] if c in preview_df.columns]
-rows_to_show = min(50, len(preview_df))
-if rows_to_show:
-    st.dataframe(
-        preview_df.sample(rows_to_show, random_state=42)[show_cols],
-        use_container_width=True
-    )
+show_cols = [c for c in ["source", "country", "year", "metric", "value", "unit"] if c in df.columns]
+preview = _preview_sample(df, src_pick, tuple(show_cols), 50)
+if len(preview):
+    st.dataframe(preview, use_container_width=True)
 else:
     st.info("No rows for the current selection.")
 
@@ -86,7 +105,7 @@ if not wb.empty:
     )
     if countries:
         m = wb[wb["country"].isin(countries)]
-        fig = px.line(
+        fig = _px().line(
             m.sort_values(["country", "year"]),
             x="year", y="value", color="country",
             labels={"value": "% of GDP", "year": "Year"},
@@ -106,10 +125,16 @@ if not unpk.empty:
         .nlargest(top_n, "value")
         .sort_values("value", ascending=True)
     )
-    fig2 = px.bar(
-        topn, x="value", y="country", orientation="h",
-        labels={"value": "Troops", "country": ""},
-        title=f"Top UN PKO Troop Contributors — {int(latest)}"
+    fig2 = _go().Figure(
+        _go().Bar(
+            x=topn["value"].to_numpy(),
+            y=topn["country"].to_numpy(),
+            orientation="h",
+        )
+    )
+    fig2.update_layout(
+        title=f"Top UN PKO Troop Contributors — {int(latest)}",
+        xaxis_title="Troops", yaxis_title="",
     )
     st.plotly_chart(fig2, use_container_width=True)
     st.caption("UN PKO data is global by nature, so you’ll see major contributors (often African/Asian countries).")
@@ -118,7 +143,7 @@ if not unpk.empty:
 dod = df[df["metric"] == "DoD Obligations"]
 if not dod.empty:
     st.markdown("### USAspending — DoD Obligations by Fiscal Year (United States)")
-    fig3 = px.line(
+    fig3 = _px().line(
         dod.sort_values("year"),
         x="year", y="value",
         title="USAspending: DoD Obligations by Fiscal Year",
@@ -136,67 +161,191 @@ OMB_TABLE_32_XLS = (
     "https://obamawhitehouse.archives.gov/sites/default/files/omb/budget/fy2016/assets/hist03z2.xls"
 )
 UA = {"User-Agent": "ReadinessDashboard/1.0 (+contact)"}
+OMB_CACHE_DIR = Path.home() / ".cache" / "omb"
+
+# Compiled once; these run inside the parse path and on cached reruns
+_YEAR_RE = re.compile(r"\d{4}")
+_LEAD_CODE_RE = re.compile(r"^\s*\d+\s+")
+_SUBFUNC_CODE_RE = re.compile(r"^\s*(\d{3})\s")
+
+def _latest_omb_parquet(max_age: int = 24 * 3600) -> Path | None:
+    """Offline fallback: the newest cached parquet, if reasonably fresh."""
+    try:
+        candidates = sorted(OMB_CACHE_DIR.glob("*.parquet"), key=lambda p: p.stat().st_mtime)
+    except Exception:
+        return None
+    if candidates and time.time() - candidates[-1].stat().st_mtime < max_age:
+        return candidates[-1]
+    return None
+
+def _omb_cache_path() -> Path | None:
+    """
+    Parquet cache file keyed by the server's ETag/Last-Modified, so the
+    .xls is only re-downloaded and re-parsed when OMB republishes it
+    (not on every worker restart).
+    """
+    try:
+        head = SESSION.head(OMB_TABLE_32_XLS, headers=UA, timeout=10, allow_redirects=True)
+        tag = head.headers.get("ETag") or head.headers.get("Last-Modified")
+    except Exception:
+        return _latest_omb_parquet()
+    if not tag:
+        return _latest_omb_parquet()
+    key = hashlib.sha1(tag.encode("utf-8")).hexdigest()[:16]
+    return OMB_CACHE_DIR / f"{key}.parquet"
+
+_OMB_META_PATH = OMB_CACHE_DIR / "meta.json"
+
+def _read_omb_meta() -> dict:
+    try:
+        return json.loads(_OMB_META_PATH.read_text())
+    except Exception:
+        return {}
+
+def _write_omb_meta(meta: dict) -> None:
+    try:
+        _OMB_META_PATH.parent.mkdir(parents=True, exist_ok=True)
+        _OMB_META_PATH.write_text(json.dumps(meta))
+    except Exception:
+        pass  # best-effort, like the parquet cache
+
+def _aggregate_outlays(sub: pd.DataFrame) -> pd.DataFrame:
+    """Sum outlays per year for one subfunction code (dense-range bincount)."""
+    sub = sub.dropna(subset=["year", "outlays"])
+    if sub.empty:
+        return pd.DataFrame(columns=["year", "outlays"])
+    # Years are a dense small range, so bincount beats a hash groupby here
+    years = sub["year"].to_numpy(dtype=np.int64)
+    year_min = int(years.min())
+    idx = years - year_min
+    sums = np.bincount(idx, weights=sub["outlays"].to_numpy(dtype=np.float64))
+    counts = np.bincount(idx)
+    return pd.DataFrame(
+        {"year": np.arange(year_min, year_min + sums.size), "outlays": sums}
+    )[counts > 0].reset_index(drop=True)
+
+def _group_defense_series(tidy: pd.DataFrame) -> dict[str, pd.DataFrame]:
+    """
+    Pre-aggregate outlays per year for each 3-digit subfunction code
+    (050, 051, ...). Computed once inside the cached fetch, so a radio
+    toggle between series is a plain dict lookup on the rerun path.
+    """
+    code = tidy["line"].astype(str).str.extract(_SUBFUNC_CODE_RE, expand=False)
+    return {c: _aggregate_outlays(sub) for c, sub in tidy.groupby(code)}
 
 @st.cache_data(ttl=24*3600, show_spinner=False)
-def fetch_omb_table_32() -> pd.DataFrame:
+def fetch_omb_table_32() -> tuple[pd.DataFrame, dict[str, pd.DataFrame]]:
     """
     Download and parse OMB Historical Table 3.2.
-    Returns tidy df: ['line','label','year','outlays'] in current $.
+    Returns (tidy df ['line','label','year','outlays'] in current $,
+    {subfunction code -> rows} for the chart series).
     """
-    resp = requests.get(OMB_TABLE_32_XLS, headers=UA, timeout=30)
-    resp.raise_for_status()
-    bio = io.BytesIO(resp.content)
-
-    # Read sheet (older .xls requires xlrd)
+    cache_path = _omb_cache_path()
+    if cache_path is not None and cache_path.exists():
+        try:
+            tidy = pd.read_parquet(cache_path)
+            return tidy, _group_defense_series(tidy)
+        except Exception:
+            pass  # corrupt/old cache file: fall through to a fresh fetch
+
+    # Stream into a single buffer instead of resp.content + BytesIO copy,
+    # which held two full copies of the workbook in memory
+    with SESSION.get(OMB_TABLE_32_XLS, headers=UA, timeout=30, stream=True) as resp:
+        resp.raise_for_status()
+        bio = io.BytesIO()
+        # the raw urllib3 stream doesn't undo Content-Encoding on its own;
+        # without this a gzipped response hands compressed bytes to the
+        # Excel readers
+        resp.raw.decode_content = True
+        shutil.copyfileobj(resp.raw, bio)
+    bio.seek(0)
+
+    # Read sheet once; calamine (Rust) is far faster than xlrd on legacy .xls
     try:
-        xls = pd.ExcelFile(bio)
-        sheet = xls.sheet_names[0]
-        raw = pd.read_excel(bio, sheet_name=sheet, header=None, engine="xlrd")
+        raw = pd.read_excel(bio, sheet_name=0, header=None, engine="calamine")
     except Exception:
-        # fallback: let pandas pick an engine if available
+        # fallback: older stacks without python-calamine (xlrd handles .xls)
         bio.seek(0)
-        raw = pd.read_excel(bio, header=None)
+        raw = pd.read_excel(bio, sheet_name=0, header=None)
+
+    # The sheet layout is fixed until OMB republishes: reuse the header row /
+    # year columns recorded for this ETag and skip the scans entirely
+    meta = _read_omb_meta()
+    meta_key = cache_path.stem if cache_path is not None else None
+    meta_ok = bool(meta_key) and meta.get("etag_key") == meta_key
 
-    # Find header row (col 0 == 'Function and subfunction')
     header_row_idx = None
-    for i in range(min(20, len(raw))):
-        if str(raw.iloc[i, 0]).strip().lower().startswith("function and subfunction"):
-            header_row_idx = i
-            break
+    if meta_ok:
+        hr = meta.get("header_row")
+        if isinstance(hr, int) and 0 <= hr < len(raw):
+            header_row_idx = hr
     if header_row_idx is None:
-        header_row_idx = 2
-
-    cols = raw.iloc[header_row_idx].tolist()
-    df_omb = raw.iloc[header_row_idx + 1:].copy()
-    df_omb.columns = cols
+        # Find header row (col 0 == 'Function and subfunction') in one vectorized scan
+        col0 = raw.iloc[:20, 0].astype(str).str.strip().str.lower()
+        hits = col0.str.startswith("function and subfunction")
+        header_row_idx = int(hits.idxmax()) if hits.any() else 2
+
+    # set_axis on the slice: no intermediate copy of the sheet body
+    cols = [str(c) for c in raw.iloc[header_row_idx].tolist()]
+    df_omb = raw.iloc[header_row_idx + 1:].set_axis(cols, axis=1)
     df_omb = df_omb.rename(columns={df_omb.columns[0]: "Function and subfunction"})
 
     # Keep numeric year columns and the label column
-    year_cols = [c for c in df_omb.columns if re.fullmatch(r"\d{4}", str(c))]
+    year_cols = None
+    if meta_ok:
+        cached = meta.get("year_cols")
+        if cached and set(cached).issubset(df_omb.columns):
+            year_cols = cached
+    if year_cols is None:
+        # one vectorized string kernel over the Index, not a per-column regex
+        year_mask = df_omb.columns.astype(str).str.fullmatch(_YEAR_RE)
+        year_cols = df_omb.columns[year_mask].tolist()
+        _write_omb_meta({"etag_key": meta_key, "header_row": header_row_idx, "year_cols": year_cols})
     keep = ["Function and subfunction"] + year_cols
-    df_omb = df_omb[keep].copy()
+    df_omb = df_omb[keep]
 
     # Drop rows that are completely NaN across years
     df_omb = df_omb.dropna(axis=0, how="all", subset=year_cols)
 
-    # Tidy
-    tidy = df_omb.melt(id_vars=["Function and subfunction"], var_name="year", value_name="outlays")
-    tidy["year"] = pd.to_numeric(tidy["year"], errors="coerce").astype("Int64")
-    tidy["outlays"] = pd.to_numeric(tidy["outlays"], errors="coerce")
-
-    # Label extraction
-    tidy["line"] = tidy["Function and subfunction"].fillna("").astype(str)
-    tidy["label"] = tidy["line"].str.replace(r"^\s*\d+\s+", "", regex=True)
-
-    return tidy[["line", "label", "year", "outlays"]].reset_index(drop=True)
-
-def pick_defense_series(tidy: pd.DataFrame, which: str = "050") -> pd.DataFrame:
+    # Tidy via repeat/tile over numpy views instead of melt's generic reshape
+    # path. The same ~100 function strings repeat for every year, so lines
+    # stay dictionary-encoded: only their int8 codes get repeated.
+    year_arr = np.array([int(y) for y in year_cols], dtype=np.int16)
+    vals = df_omb[year_cols].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float32)
+    lines = pd.Categorical(df_omb["Function and subfunction"].fillna("").astype(str))
+    n_rows, n_years = vals.shape
+
+    tidy = pd.DataFrame(
+        {
+            "line": pd.Categorical.from_codes(
+                np.repeat(lines.codes, n_years), categories=lines.categories
+            ),
+            "year": np.tile(year_arr, n_rows),
+            "outlays": vals.ravel(),
+        }
+    )
+    # Label extraction over the category index (~100 strings), not per row
+    label_map = {c: _LEAD_CODE_RE.sub("", c) for c in lines.categories}
+    tidy["label"] = tidy["line"].map(label_map).astype("category")
+    tidy = tidy[["line", "label", "year", "outlays"]]
+
+    if cache_path is not None:
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tidy.to_parquet(cache_path, compression="zstd")
+        except Exception:
+            pass  # disk cache is best-effort; the in-memory cache still applies
+    return tidy, _group_defense_series(tidy)
+
+def pick_defense_series(groups: dict[str, pd.DataFrame], which: str = "050") -> pd.DataFrame:
     """
     which: "050" (total National Defense) or "051" (DoD–Military)
     """
     assert which in {"050", "051"}
-    m = tidy["line"].str.strip().str.startswith(which + " ")
-    sel = tidy[m].groupby("year", as_index=False)["outlays"].sum().sort_values("year")
+    sel = groups.get(which)
+    if sel is None:
+        return pd.DataFrame(columns=["year", "outlays", "series"])
+    sel = sel.copy()
     sel["series"] = f"National defense ({which}*)"
     return sel
 
@@ -210,7 +359,7 @@ series_choice = st.radio(
 err = None
 with st.spinner("Downloading OMB Historical Table 3.2 …"):
     try:
-        tidy = fetch_omb_table_32()
+        tidy, omb_groups = fetch_omb_table_32()
     except Exception as e:
         err = e
 
@@ -218,8 +367,8 @@ if err:
     st.error(f"Could not fetch OMB table: {err}")
 else:
     series_code = "050" if series_choice.startswith("050") else "051"
-    s = pick_defense_series(tidy, which=series_code)
-    fig = px.line(
+    s = pick_defense_series(omb_groups, which=series_code)
+    fig = _px().line(
         s, x="year", y="outlays",
         title=f"OMB Outlays — National Defense ({series_code}) — Current $",
         markers=True
@@ -257,18 +406,107 @@ COUNTRY_FIXES = {
     "eswatini": "Eswatini",
 }
 
-def to_iso3(name: str) -> str | None:
-    if not HAVE_PYCOUNTRY:
-        return None
-    n = (name or "").strip()
-    if not n:
-        return None
-    fixed = COUNTRY_FIXES.get(n.lower(), n)
+# lowercased alias -> lowercased canonical, so normalization is a single
+# vectorized Series.replace instead of per-row dict gets
+COUNTRY_FIXES_LOWER = {k: v.lower() for k, v in COUNTRY_FIXES.items()}
+
+# Single compiled alternation over every fix alias (longest first): one regex
+# pass catches names that merely *contain* an alias, as a fallback for the
+# rows the exact-match map misses
+_FIXES_PAT = re.compile(
+    "|".join(map(re.escape, sorted(COUNTRY_FIXES, key=len, reverse=True))),
+    re.IGNORECASE,
+)
+
+def _fix_embedded(name: str) -> str:
+    return _FIXES_PAT.sub(lambda m: COUNTRY_FIXES_LOWER[m.group(0).lower()], name)
+
+@st.cache_resource(show_spinner=False)
+def _iso3_map() -> dict[str, str]:
+    """
+    One-shot {lowercased name -> alpha_3} table covering pycountry's name/
+    official_name/common_name plus every COUNTRY_FIXES alias. A single dict
+    lookup replaces pycountry.countries.lookup(), which scans the whole
+    country table per call. cache_resource shares the same dict object
+    across sessions and reruns, so it is built once per process — and the
+    pycountry import itself (which eagerly loads its country DB) is
+    deferred until the first upload needs it. Empty dict when pycountry
+    is not installed.
+    """
     try:
-        c = pycountry.countries.lookup(fixed)
-        return c.alpha_3
+        import pycountry
     except Exception:
-        return None
+        return {}
+    m: dict[str, str] = {}
+    for c in pycountry.countries:
+        m[c.name.lower()] = c.alpha_3
+        for attr in ("official_name", "common_name"):
+            alias = getattr(c, attr, "")
+            if alias:
+                m[alias.lower()] = c.alpha_3
+    for alias, canonical in COUNTRY_FIXES.items():
+        code = m.get(canonical.lower())
+        if code is None:
+            try:
+                code = pycountry.countries.lookup(canonical).alpha_3
+            except Exception:
+                code = None
+        if code:
+            m[alias] = code
+    return m
+
+def to_iso3(name: str) -> str | None:
+    n = (name or "").strip().lower()
+    return _iso3_map().get(n)
+
+_CSV_CHUNK_ROWS = 200_000
+_BIG_CSV_BYTES = 50 * 1024 * 1024
+
+def _detect_deployment_cols(df: pd.DataFrame) -> tuple[str, str]:
+    """Locate the country and personnel columns in a DMDC-style frame."""
+    cols = {c.lower(): c for c in df.columns}
+    country_col = next((cols[c] for c in ("country", "location", "country/territory", "duty location") if c in cols), None)
+    if not country_col:
+        country_col = df.columns[0]
+    numeric_cols = [c for c in df.select_dtypes(include="number").columns if c != country_col]
+    personnel_col = numeric_cols[0] if numeric_cols else df.columns[-1]
+    return country_col, personnel_col
+
+def _finalize_deployments(out: pd.DataFrame) -> pd.DataFrame:
+    # personnel is already numeric here; one dropna+cast, no extra copies
+    # (int32 halves the frame and the Plotly payload vs the default int64)
+    out = out.dropna(subset=["country", "personnel"]).astype({"personnel": "int32"})
+    iso3_map = _iso3_map()
+    if iso3_map:
+        # strip/lower/fix/lookup as one chain of C kernels, no Python loop
+        norm = (
+            out["country"].astype(str).str.strip().str.lower()
+            .replace(COUNTRY_FIXES_LOWER)
+        )
+        iso3 = norm.map(iso3_map)
+        misses = iso3.isna()
+        if misses.any():
+            # slow path, only for the handful of rows the exact map missed
+            iso3.loc[misses] = norm[misses].map(_fix_embedded).map(iso3_map)
+        out["iso3"] = iso3
+    return out
+
+def _load_deployments_csv_chunked(file) -> pd.DataFrame:
+    """
+    Constant-memory path for very large CSVs: peek a few rows to find the
+    country/personnel columns, then aggregate personnel by country chunk by
+    chunk instead of materializing the whole file.
+    """
+    peek = pd.read_csv(file, nrows=_CSV_CHUNK_ROWS)
+    country_col, personnel_col = _detect_deployment_cols(peek)
+    file.seek(0)
+    totals = None
+    for chunk in pd.read_csv(file, usecols=[country_col, personnel_col], chunksize=_CSV_CHUNK_ROWS):
+        chunk[personnel_col] = pd.to_numeric(chunk[personnel_col], errors="coerce")
+        part = chunk.dropna(subset=[country_col]).groupby(country_col)[personnel_col].sum()
+        totals = part if totals is None else totals.add(part, fill_value=0)
+    out = totals.rename("personnel").rename_axis("country").reset_index()
+    return _finalize_deployments(out)
 
 def load_deployments_table(file) -> pd.DataFrame:
     """
@@ -276,35 +514,60 @@ def load_deployments_table(file) -> pd.DataFrame:
     Returns df with columns: country, iso3 (if available), personnel.
     """
     name = getattr(file, "name", "").lower()
-    if name.endswith(".xlsx") or name.endswith(".xls"):
-        # engine auto-pick; older xls needs xlrd (included in requirements)
-        df = pd.read_excel(file)
+    ext = name.rsplit(".", 1)[-1] if "." in name else ""
+    if ext in ("xlsx", "xls"):
+        # calamine reads both formats and streams typed cells without building
+        # the openpyxl/xlrd cell-object graph; only the first sheet is parsed
+        try:
+            df = pd.read_excel(file, sheet_name=0, engine="calamine")
+        except Exception:
+            file.seek(0)
+            if ext == "xlsx":
+                import openpyxl
+                wb = openpyxl.load_workbook(file, read_only=True, data_only=True)
+                try:
+                    rows = wb.worksheets[0].iter_rows(values_only=True)
+                    header = next(rows, None)
+                    df = pd.DataFrame(rows, columns=header)
+                finally:
+                    wb.close()
+            else:
+                # legacy .xls needs xlrd (included in requirements)
+                df = pd.read_excel(file, sheet_name=0)
     else:
+        # historical DMDC dumps can dwarf Streamlit Cloud's RAM tier;
+        # aggregate those chunk by chunk instead of loading the whole file
+        size = getattr(file, "size", 0) or 0
+        if size > _BIG_CSV_BYTES and file.seekable():
+            return _load_deployments_csv_chunked(file)
         df = pd.read_csv(file)
 
-    cols = {c.lower(): c for c in df.columns}
-    country_col = next((cols[c] for c in ("country", "location", "country/territory", "duty location") if c in cols), None)
-    if not country_col:
-        country_col = df.columns[0]
-
-    personnel_col = None
-    for c in df.columns:
-        if c == country_col:
-            continue
-        if pd.api.types.is_numeric_dtype(df[c]):
-            personnel_col = c
-            break
-    if not personnel_col:
-        c = df.columns[-1]
-        df[c] = pd.to_numeric(df[c], errors="coerce")
-        personnel_col = c
-
-    out = df[[country_col, personnel_col]].rename(columns={country_col: "country", personnel_col: "personnel"})
-    out = out.dropna(subset=["country", "personnel"])
-    out["personnel"] = pd.to_numeric(out["personnel"], errors="coerce").fillna(0).astype(int)
-    if HAVE_PYCOUNTRY:
-        out["iso3"] = out["country"].apply(to_iso3)
-    return out
+    country_col, personnel_col = _detect_deployment_cols(df)
+    # single allocation with proper dtypes instead of select/rename/coerce copies
+    out = pd.DataFrame(
+        {
+            "country": df[country_col].astype("string"),
+            "personnel": pd.to_numeric(df[personnel_col], errors="coerce"),
+        }
+    )
+    return _finalize_deployments(out)
+
+def _top_n(dep: pd.DataFrame, n: int) -> pd.DataFrame:
+    # O(N) partial selection via argpartition; only the n winners get sorted
+    arr = dep["personnel"].to_numpy()
+    k = min(n, len(arr))
+    if k == 0:
+        return dep
+    idx = np.argpartition(-arr, k - 1)[:k]
+    return dep.iloc[idx].sort_values("personnel", ascending=False)
+
+@st.cache_data(show_spinner=False)
+def _csv_bytes(df: pd.DataFrame) -> bytes:
+    # download_button payloads are built on every rerun; cache on the frame
+    # hash so slider/radio interactions stop re-serializing the CSV
+    buf = io.BytesIO()
+    df.to_csv(buf, index=False)
+    return buf.getvalue()
 
 up = st.file_uploader(
     "Upload DMDC (or similar) Excel/CSV",
@@ -316,29 +579,30 @@ if up is not None:
     try:
         dep = load_deployments_table(up)
         st.success(f"Parsed {len(dep)} rows.")
-        if HAVE_PYCOUNTRY and dep.get("iso3") is not None and dep["iso3"].notna().any():
-            fig = px.choropleth(
-                dep, locations="iso3", color="personnel",
-                color_continuous_scale="Blues",
-                hover_name="country",
-                title="Active duty (or total) personnel by country"
+        if "iso3" in dep.columns and dep["iso3"].notna().any():
+            fig = _go().Figure(
+                _go().Choropleth(
+                    locations=dep["iso3"].to_numpy(),
+                    z=dep["personnel"].to_numpy(),
+                    colorscale="Blues",
+                    text=dep["country"].to_numpy(),
+                )
+            )
+            fig.update_layout(
+                title="Active duty (or total) personnel by country",
+                height=520, geo=dict(showframe=False),
             )
-            fig.update_layout(height=520, geo=dict(showframe=False))
             st.plotly_chart(fig, use_container_width=True)
         else:
             st.info("Install `pycountry` to enable ISO-code mapping and world map. Showing table instead.")
             st.dataframe(dep.sort_values("personnel", ascending=False), use_container_width=True)
 
         topn = st.slider("Top N countries (deployments)", 5, 30, 10, key="dep_topn")
-        st.bar_chart(
-            dep.sort_values("personnel", ascending=False)
-               .head(topn)
-               .set_index("country")["personnel"]
-        )
+        st.bar_chart(_top_n(dep, topn).set_index("country")["personnel"])
 
         st.download_button(
             "Download cleaned deployments CSV",
-            dep.to_csv(index=False).encode("utf-8"),
+            _csv_bytes(dep),
             file_name="deployments_clean.csv",
             mime="text/csv",
             key="dep_dl",
@@ -355,23 +619,35 @@ st.divider()
 # ------------------------------------------------------------------------------------
 st.header("3) Installations — points CSV (optional upload)")
 
+# header alias -> canonical column for installations uploads
+_INSTALL_COL_CANON = {
+    "name": "name", "installation": "name", "base": "name",
+    "lat": "lat", "latitude": "lat",
+    "lon": "lon", "lng": "lon", "longitude": "lon",
+    "service": "service", "branch": "service",
+}
+
 def load_installations_csv(file) -> pd.DataFrame:
-    df = pd.read_csv(file)
-    rename_map = {}
-    for c in df.columns:
-        lc = c.strip().lower()
-        if lc in {"name", "installation", "base"}:
-            rename_map[c] = "name"
-        elif lc in {"lat", "latitude"}:
-            rename_map[c] = "lat"
-        elif lc in {"lon", "lng", "longitude"}:
-            rename_map[c] = "lon"
-        elif lc in {"service", "branch"}:
-            rename_map[c] = "service"
+    # pyarrow parses multithreaded and keeps strings in Arrow arrays
+    # (lower memory than object dtype); fall back to the default engine
+    try:
+        df = pd.read_csv(file, engine="pyarrow", dtype_backend="pyarrow")
+    except Exception:
+        file.seek(0)
+        df = pd.read_csv(file)
+    # one vectorized pass over the header instead of the per-column if/elif chain
+    lowered = df.columns.str.strip().str.lower()
+    rename_map = {
+        c: _INSTALL_COL_CANON[lc]
+        for c, lc in zip(df.columns, lowered)
+        if lc in _INSTALL_COL_CANON
+    }
     df = df.rename(columns=rename_map)
     needed = {"name", "lat", "lon"}
     if not needed.issubset(set(df.columns)):
         raise ValueError("Installations CSV must have at least: name, lat, lon")
+    # float32 is well below pixel precision for map coordinates
+    df[["lat", "lon"]] = df[["lat", "lon"]].astype("float32")
     return df
 
 ins = st.file_uploader(
@@ -384,7 +660,7 @@ if ins is not None:
         bases = load_installations_csv(ins)
         st.success(f"Parsed {len(bases)} installations.")
         color_col = "service" if "service" in bases.columns else None
-        fig = px.scatter_geo(
+        fig = _px().scatter_geo(
             bases, lat="lat", lon="lon", hover_name="name",
             color=color_col, title="Installations map (uploaded CSV)"
         )
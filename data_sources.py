@@ -1,9 +1,21 @@
 # data_sources.py
+import hashlib
+import importlib
 import io
+import json
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from pathlib import Path
+
+import numpy as np
 
 import pandas as pd
+from pandas.api.types import union_categoricals
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Optional Streamlit cache (safe no-op outside Streamlit)
 try:
@@ -13,88 +25,281 @@ except Exception:
     def cache(func=None, **_):
         return func
 
+# Optional fast JSON decode for the larger API payloads (safe fallback to stdlib)
+try:
+    import orjson
+except Exception:
+    orjson = None
+
+# The fetchers are reached through REGISTRY; everything else is plumbing
+__all__ = ["REGISTRY", "SESSION", "load_selected"]
+
 UA = {"User-Agent": "ReadinessDashboard/1.0 (+contact)"}
 TIMEOUT = 30
 
 
-# ---------- Helpers ----------
-def _wb_indicator_to_df(code: str, countries="all", start=1990, end=None,
-                        metric_name: str = "", unit: str = "") -> pd.DataFrame:
+def _loads_response(r):
+    """Decode a requests Response body as JSON, via orjson when available."""
+    if orjson is not None:
+        return orjson.loads(r.content)
+    return r.json()
+
+
+# ---------- Parsed-frame parquet cache (CSV sources) ----------
+_PARQUET_CACHE_DIR = Path.home() / ".cache" / "dd"
+_PARQUET_TTL = 3600  # aligned with the HTTP cache expiry
+
+
+def _parquet_cache_path(url: str) -> Path:
+    return _PARQUET_CACHE_DIR / f"{hashlib.sha1(url.encode('utf-8')).hexdigest()[:16]}.parquet"
+
+
+def _cached_parquet(url: str, max_age: int | None = _PARQUET_TTL) -> pd.DataFrame | None:
     """
-    Generic World Bank indicator fetcher -> tidy DF.
+    Parsed frame for this URL, or None on miss/expiry/any engine error.
+    max_age=None skips the TTL check — used after a 304, where the server
+    itself has vouched that the cached bytes are still current.
     """
-    if end is None:
-        end = datetime.now().year
-    url = (
-        f"https://api.worldbank.org/v2/country/{countries}/indicator/{code}"
-        f"?format=json&per_page=20000&date={start}:{end}"
-    )
+    path = _parquet_cache_path(url)
     try:
-        r = requests.get(url, headers=UA, timeout=TIMEOUT)
-        r.raise_for_status()
-        data = r.json()
+        if path.exists() and (max_age is None or time.time() - path.stat().st_mtime < max_age):
+            return pd.read_parquet(path)
     except Exception:
-        return pd.DataFrame()
-
-    if not isinstance(data, list) or len(data) < 2 or not isinstance(data[1], list):
-        return pd.DataFrame()
-
-    rows = []
-    for rec in data[1]:
-        val = rec.get("value")
-        if val is None:
-            continue
-        rows.append(
-            {
-                "source": "World Bank",
-                "country": rec.get("country", {}).get("value"),
-                "year": int(rec.get("date", 0) or 0),
-                "metric": metric_name or code,
-                "value": float(val),
-                "unit": unit,
+        pass
+    return None
+
+
+def _store_parquet(url: str, df: pd.DataFrame, headers=None) -> None:
+    """Best-effort write-through; the caller's return value is unaffected."""
+    path = _parquet_cache_path(url)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        df.to_parquet(path, compression="zstd")
+        if headers is not None:
+            meta = {
+                "etag": headers.get("ETag"),
+                "last_modified": headers.get("Last-Modified"),
             }
+            path.with_suffix(".meta.json").write_text(json.dumps(meta))
+    except Exception:
+        pass
+
+
+def _validator_headers(url: str) -> dict:
+    """UA plus If-None-Match/If-Modified-Since from the parquet sidecar."""
+    headers = dict(UA)
+    try:
+        meta = json.loads(_parquet_cache_path(url).with_suffix(".meta.json").read_text())
+    except Exception:
+        return headers
+    if meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+    return headers
+
+
+def _get_revalidated(url: str) -> tuple:
+    """
+    GET with cache validators. Returns (response, revived_frame): on a 304
+    whose parquet revives, revived_frame is the cached DataFrame; if the
+    parquet is gone or unreadable despite the 304 (the sidecar can outlive
+    it), the stale sidecar is dropped and the body refetched in full so the
+    source can't wedge on an empty 304 response.
+    """
+    r = SESSION.get(url, headers=_validator_headers(url), timeout=TIMEOUT)
+    if r.status_code == 304:
+        stale = _cached_parquet(url, max_age=None)
+        if stale is not None:
+            return r, stale
+        _parquet_cache_path(url).with_suffix(".meta.json").unlink(missing_ok=True)
+        r = SESSION.get(url, headers=UA, timeout=TIMEOUT)
+    r.raise_for_status()
+    return r, None
+
+# Shared session: HTTP keep-alive reuses TCP/TLS connections across calls,
+# and the session is thread-safe for the GETs below. With requests-cache
+# installed, response bodies persist in SQLite across worker restarts and
+# revalidate via ETag/Last-Modified (304s skip the body download).
+try:
+    import requests_cache
+    SESSION = requests_cache.CachedSession(
+        "cache/http",
+        backend="sqlite",
+        expire_after=3600,
+        cache_control=True,
+        allowable_methods=("GET",),
+    )
+except Exception:
+    SESSION = requests.Session()
+
+# Pooled connections sized for the parallel fetchers, with retry/backoff on
+# transient upstream errors (requests.Session is thread-safe for these GETs)
+_adapter = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504]),
+)
+SESSION.mount("https://", _adapter)
+SESSION.mount("http://", _adapter)
+
+
+# ---------- Helpers ----------
+_FINAL_COLS = ["source", "country", "year", "metric", "value", "unit"]
+_CATEGORY_COLS = ("source", "country", "metric", "unit")
+
+
+def _finalize(df: pd.DataFrame, value_dtype: str = "float32") -> pd.DataFrame:
+    """
+    Normalize a fetcher's output to the shared schema and dtypes, so the
+    pd.concat in load_selected stitches aligned blocks instead of upcasting
+    heterogeneous columns. The low-cardinality label columns become category
+    dtype: one small string table per column instead of millions of Python
+    string objects. Years fit Int16 and most values fit float32, halving the
+    numeric footprint; fetchers whose values exceed float32 precision pass
+    value_dtype="float64".
+    """
+    if df.empty:
+        return pd.DataFrame(columns=_FINAL_COLS).astype(
+            {col: "category" for col in _CATEGORY_COLS}
         )
-    df = pd.DataFrame(rows)
-    if not df.empty:
-        df = df.dropna(subset=["value"])
-        df["year"] = pd.to_numeric(df["year"], errors="coerce").astype("Int64")
+    df = df.reindex(columns=_FINAL_COLS)
+    df["year"] = pd.to_numeric(df["year"], errors="coerce").astype("Int16")
+    df["value"] = pd.to_numeric(df["value"], errors="coerce").astype(value_dtype)
+    for col in _CATEGORY_COLS:
+        # cast through object first: pyarrow-backed string columns (OWID's
+        # dtype_backend="pyarrow" read) would otherwise yield string[pyarrow]
+        # categories, which union_categoricals refuses to mix with the
+        # object-backed ones from the other sources
+        df[col] = df[col].astype("object").astype("category")
     return df
 
 
+def _wb_indicator_to_df(code: str, countries: str | list[str] = "all", start=1990, end=None,
+                        metric_name: str = "", unit: str = "") -> pd.DataFrame:
+    """
+    Generic World Bank indicator fetcher -> tidy DF. `countries` is either a
+    WB country expression ("all", "USA") or a list of ISO codes; lists are
+    split into ~30-code semicolon batches fetched concurrently, keeping URLs
+    short and overlapping the API's per-request latency.
+    """
+    if end is None:
+        end = datetime.now().year
+
+    def _fetch_batch(batch: str) -> list:
+        url = (
+            f"https://api.worldbank.org/v2/country/{batch}/indicator/{code}"
+            f"?format=json&per_page=20000&date={start}:{end}"
+        )
+        try:
+            r = SESSION.get(url, headers=UA, timeout=TIMEOUT)
+            r.raise_for_status()
+            data = _loads_response(r)
+        except Exception:
+            return []
+        if not isinstance(data, list) or len(data) < 2 or not isinstance(data[1], list):
+            return []
+        return [rec for rec in data[1] if rec.get("value") is not None]
+
+    if isinstance(countries, str):
+        records = _fetch_batch(countries)
+    else:
+        batches = [";".join(countries[i:i + 30]) for i in range(0, len(countries), 30)]
+        records = []
+        if batches:  # ThreadPoolExecutor rejects max_workers=0
+            with ThreadPoolExecutor(max_workers=min(4, len(batches))) as ex:
+                for batch_records in ex.map(_fetch_batch, batches):
+                    records.extend(batch_records)
+
+    if not records:
+        return _finalize(pd.DataFrame())
+
+    # AoS -> SoA: build each column once instead of one dict per record
+    df = pd.DataFrame(
+        {
+            "source": "World Bank",
+            "country": [(rec.get("country") or {}).get("value") for rec in records],
+            "year": np.array([int(rec.get("date", 0) or 0) for rec in records], dtype=np.int64),
+            "metric": metric_name or code,
+            "value": np.array([rec["value"] for rec in records], dtype=np.float64),
+            "unit": unit,
+        }
+    )
+    return _finalize(df)
+
+
+# url -> (entity, year, value) header names; a grapher URL's layout is
+# effectively constant, so resolve it once per process
+_OWID_COL_CACHE: dict[str, tuple[str, str, str]] = {}
+
+
 def _owid_grapher_csv_to_df(url: str, value_col: str, metric_name: str, unit: str) -> pd.DataFrame:
     """
     Our World in Data 'grapher' CSVs usually have columns: Entity, Code, Year, <value_col>.
     We reshape that into our standard schema.
     """
+    cached = _cached_parquet(url)
+    if cached is not None:
+        return cached
+
     try:
-        df = pd.read_csv(url)
+        # fetched through the shared session so OWID reads get keep-alive,
+        # retries and the persistent HTTP cache like every other source;
+        # a 304 revives the parsed parquet frame regardless of its TTL
+        r, revived = _get_revalidated(url)
+        if revived is not None:
+            return revived
+        content = r.content
     except Exception:
-        return pd.DataFrame()
+        return _finalize(pd.DataFrame())
 
-    # Normalize common OWID casing
-    # Some files use 'Entity'/'entity', 'Year'/'year'
-    cols = {c.lower(): c for c in df.columns}
-    ent = cols.get("entity") or cols.get("country") or "Entity"
-    yr = cols.get("year") or "Year"
-    val = value_col if value_col in df.columns else cols.get(value_col.lower())
-
-    if ent not in df.columns or yr not in df.columns or val not in df.columns:
-        return pd.DataFrame()
+    resolved = _OWID_COL_CACHE.get(url)
+    if resolved is None:
+        try:
+            # Cheap header-only probe: normalize 'Entity'/'entity' casing
+            # drift before deciding which three columns to actually parse
+            header = pd.read_csv(io.BytesIO(content), nrows=0).columns
+        except Exception:
+            return _finalize(pd.DataFrame())
+        cols = {c.lower(): c for c in header}
+        ent = cols.get("entity") or cols.get("country")
+        yr = cols.get("year")
+        val = value_col if value_col in header else cols.get(value_col.lower())
+        if not (ent and yr and val):
+            return _finalize(pd.DataFrame())
+        resolved = _OWID_COL_CACHE[url] = (ent, yr, val)
+    else:
+        ent, yr, val = resolved
+
+    usecols = [ent, yr, val]
+    try:
+        # pyarrow: multithreaded parse, Arrow strings instead of objects;
+        # the unused columns (Code, ...) are never materialized
+        df = pd.read_csv(io.BytesIO(content), usecols=usecols, engine="pyarrow", dtype_backend="pyarrow")
+    except Exception:
+        try:
+            df = pd.read_csv(io.BytesIO(content), usecols=usecols)
+        except Exception:
+            # likely a renamed column behind a stale memoized resolution —
+            # drop it so the next call re-probes the header
+            _OWID_COL_CACHE.pop(url, None)
+            return _finalize(pd.DataFrame())
 
-    out = df[[ent, yr, val]].rename(columns={ent: "country", yr: "year", val: "value"})
+    out = df.rename(columns={ent: "country", yr: "year", val: "value"})
     out["source"] = "Our World in Data"
     out["metric"] = metric_name
     out["unit"] = unit
     # tidy types
     out["year"] = pd.to_numeric(out["year"], errors="coerce").astype("Int64")
     out["value"] = pd.to_numeric(out["value"], errors="coerce")
-    out = out.dropna(subset=["value"])
-    return out[["source", "country", "year", "metric", "value", "unit"]]
+    out = _finalize(out.dropna(subset=["value"]))
+    _store_parquet(url, out, headers=r.headers)
+    return out
 
 
 # ---------- World Bank: existing ----------
 @cache
-def wb_milex_percent_gdp(countries="all", start=1990, end=datetime.now().year) -> pd.DataFrame:
+def wb_milex_percent_gdp(countries="all", start=1990, end=None) -> pd.DataFrame:
     # Military expenditure (% of GDP)
     return _wb_indicator_to_df(
         code="MS.MIL.XPND.GD.ZS",
@@ -108,7 +313,7 @@ def wb_milex_percent_gdp(countries="all", start=1990, end=datetime.now().year) -
 
 # ---------- World Bank: NEW additions ----------
 @cache
-def wb_milex_current_usd(countries="all", start=1990, end=datetime.now().year) -> pd.DataFrame:
+def wb_milex_current_usd(countries="all", start=1990, end=None) -> pd.DataFrame:
     # Military expenditure (current US$)
     # Code verified: MS.MIL.XPND.CD
     return _wb_indicator_to_df(
@@ -122,7 +327,7 @@ def wb_milex_current_usd(countries="all", start=1990, end=datetime.now().year) -
 
 
 @cache
-def wb_armed_forces_total(countries="all", start=1990, end=datetime.now().year) -> pd.DataFrame:
+def wb_armed_forces_total(countries="all", start=1990, end=None) -> pd.DataFrame:
     # Armed forces personnel, total
     # Code verified: MS.MIL.TOTL.P1
     return _wb_indicator_to_df(
@@ -136,7 +341,7 @@ def wb_armed_forces_total(countries="all", start=1990, end=datetime.now().year)
 
 
 @cache
-def wb_armed_forces_pct_labor(countries="all", start=1990, end=datetime.now().year) -> pd.DataFrame:
+def wb_armed_forces_pct_labor(countries="all", start=1990, end=None) -> pd.DataFrame:
     # Armed forces personnel (% of total labor force)
     # Code verified: MS.MIL.TOTL.TF.ZS
     return _wb_indicator_to_df(
@@ -150,6 +355,16 @@ def wb_armed_forces_pct_labor(countries="all", start=1990, end=datetime.now().ye
 
 
 # ---------- UN Peacekeeping: Troop contributors (yearly aggregate) ----------
+# Header-detection rules for the UN CSV, compiled once at import. Patterns
+# run against lowercased header names; the troops rule uses a lookahead to
+# reject the police-contribution columns.
+_UNPK_HEADER_RULES = (
+    ("country", re.compile(r"country")),
+    ("year", re.compile(r"^year$")),
+    ("troops", re.compile(r"^(?!.*police).*troop")),
+)
+
+
 @cache
 def unpk_troop_contributors() -> pd.DataFrame:
     """
@@ -157,78 +372,123 @@ def unpk_troop_contributors() -> pd.DataFrame:
     like: Country, Year, Month, Troops (or 'Troop_', 'Troops_Total', etc).
     """
     url = "https://peacekeeping.un.org/sites/default/files/mission_contributions_by_country_month_0.csv"
+    cached = _cached_parquet(url)
+    if cached is not None:
+        return cached
+
     try:
-        df = pd.read_csv(url)
+        # unchanged upstream (304) reuses the parsed frame past its TTL
+        r, revived = _get_revalidated(url)
+        if revived is not None:
+            return revived
+        content = r.content
+        # Cheap header-only probe to resolve the (drifting) column names
+        header = pd.read_csv(io.BytesIO(content), nrows=0).columns
     except Exception:
-        return pd.DataFrame()
+        return _finalize(pd.DataFrame())
 
-    # Normalize column names
-    lower_map = {c: c.lower() for c in df.columns}
-    df = df.rename(columns=lower_map)
-
-    # Country column
-    country_col = next((c for c in df.columns if "country" in c), None)
-    # Year column
-    year_col = next((c for c in df.columns if c == "year"), None)
-    # Troops column (lots of variants)
-    troop_cols = [c for c in df.columns if "troop" in c and "police" not in c]
-    troop_col = troop_cols[0] if troop_cols else None
+    lower = [c.lower() for c in header]
+    resolved = {
+        name: next((c for c, lc in zip(header, lower) if pat.search(lc)), None)
+        for name, pat in _UNPK_HEADER_RULES
+    }
+    country_col, year_col, troop_col = resolved["country"], resolved["year"], resolved["troops"]
 
     if not (country_col and year_col and troop_col):
-        return pd.DataFrame()
+        return _finalize(pd.DataFrame())
 
-    out = (
-        df[[country_col, year_col, troop_col]]
-        .rename(columns={country_col: "country", year_col: "year", troop_col: "troops"})
-    )
+    # Parse only the three columns we keep; pyarrow's reader is multithreaded
+    # and never materializes the throwaway columns
+    try:
+        import pyarrow.csv as pacsv
+        table = pacsv.read_csv(
+            io.BytesIO(content),
+            # strings_can_be_null matches pd.read_csv: empty country fields
+            # become null (and get dropped below) instead of "" groups
+            convert_options=pacsv.ConvertOptions(
+                include_columns=[country_col, year_col, troop_col],
+                strings_can_be_null=True,
+            ),
+        )
+        df = table.to_pandas()
+    except Exception:
+        df = pd.read_csv(io.BytesIO(content), usecols=[country_col, year_col, troop_col])
+
+    out = df.rename(columns={country_col: "country", year_col: "year", troop_col: "troops"})
     out["troops"] = pd.to_numeric(out["troops"], errors="coerce")
-    out = (
-        out.dropna(subset=["year"])
-        .groupby(["country", "year"], as_index=False)["troops"]
-        .sum(min_count=1)
+    out["year"] = pd.to_numeric(out["year"], errors="coerce")
+    # blank countries would factorize to -1 and wrap the uint64 key below,
+    # so drop them here along with unparseable years (the old groupby
+    # silently skipped both)
+    out = out.dropna(subset=["year", "country"])
+
+    # Pack (country code, year) into one uint64 key — year fits in 16 bits —
+    # so grouping is integer compares instead of tuple hashing. The
+    # scatter-add kernel "out[codes[i]] += values[i]" is np.bincount with
+    # weights; NaN troops are masked up front and all-NaN groups stay NaN
+    # (min_count=1 semantics).
+    country_codes, countries = pd.factorize(out["country"])
+    key = (country_codes.astype(np.uint64) << np.uint64(16)) | out["year"].to_numpy(dtype=np.uint64)
+    uniq, inv = np.unique(key, return_inverse=True)
+    troops = out["troops"].to_numpy(dtype=np.float64)
+    valid = ~np.isnan(troops)
+    sums = np.bincount(inv[valid], weights=troops[valid], minlength=uniq.size)
+    counts = np.bincount(inv[valid], minlength=uniq.size)
+    out = pd.DataFrame(
+        {
+            "country": countries[(uniq >> np.uint64(16)).astype(np.intp)],
+            "year": (uniq & np.uint64(0xFFFF)).astype(np.int64),
+            "troops": np.where(counts > 0, sums, np.nan),
+        }
     )
 
     out["source"] = "UN Peacekeeping"
     out["metric"] = "Troops contributed to UN PKO"
     out["value"] = out["troops"]
     out["unit"] = "personnel"
-    return out[["source", "country", "year", "metric", "value", "unit"]]
+    out = _finalize(out)
+    _store_parquet(url, out, headers=r.headers)
+    return out
 
 
 # ---------- USAspending: DoD obligations (by FY) ----------
 @cache
-def usaspending_dod_obligations(start_fy=2016, end_fy=datetime.now().year) -> pd.DataFrame:
+def usaspending_dod_obligations(start_fy=2016, end_fy=None) -> pd.DataFrame:
     """
     https://api.usaspending.gov/api/v2/financial_balances/agencies/?fiscal_year=YYYY
     DoD toptier_code = "097"
     """
+    if end_fy is None:
+        end_fy = datetime.now().year
     base = "https://api.usaspending.gov/api/v2/financial_balances/agencies/"
-    rows = []
-    for fy in range(start_fy, end_fy + 1):
+
+    def _fetch_fy(fy: int) -> dict | None:
         try:
-            r = requests.get(f"{base}?fiscal_year={fy}", headers=UA, timeout=TIMEOUT)
+            r = SESSION.get(f"{base}?fiscal_year={fy}", headers=UA, timeout=TIMEOUT)
             r.raise_for_status()
-            results = r.json().get("results", []) or []
+            results = _loads_response(r).get("results", []) or []
             dod = next((x for x in results if x.get("toptier_code") == "097"), None)
             if not dod:
-                continue
-            rows.append(
-                {
-                    "source": "USAspending",
-                    "country": "United States",
-                    "year": fy,
-                    "metric": "DoD Obligations",
-                    "value": float(dod.get("obligations") or 0.0),
-                    "unit": "USD",
-                }
-            )
+                return None
+            return {
+                "source": "USAspending",
+                "country": "United States",
+                "year": fy,
+                "metric": "DoD Obligations",
+                "value": float(dod.get("obligations") or 0.0),
+                "unit": "USD",
+            }
         except Exception:
-            continue
+            return None
 
-    df = pd.DataFrame(rows)
-    if not df.empty:
-        df["year"] = pd.to_numeric(df["year"], errors="coerce").astype("Int64")
-    return df
+    # one independent request per FY: issue them concurrently
+    years = list(range(start_fy, end_fy + 1))
+    with ThreadPoolExecutor(max_workers=min(8, max(1, len(years)))) as ex:
+        rows = [row for row in ex.map(_fetch_fy, years) if row]
+
+    # yearly obligations run past 1e12 dollars, beyond float32's 24-bit
+    # mantissa, so keep full double precision for this source
+    return _finalize(pd.DataFrame(rows), value_dtype="float64")
 
 
 # ---------- Our World in Data (NEW) ----------
@@ -263,41 +523,74 @@ def owid_mil_exp_share_gdp() -> pd.DataFrame:
 
 
 # ---------- Registry + loader ----------
-REGISTRY = {
+# Lazy registry: dotted "module:function" paths resolved only when a source
+# is actually selected, so unpicked fetchers never pay import/decorator cost
+REGISTRY: dict[str, str] = {
     # World Bank (existing + new)
-    "World Bank: mil exp %GDP": wb_milex_percent_gdp,
-    "World Bank: mil exp (USD)": wb_milex_current_usd,
-    "World Bank: armed forces total": wb_armed_forces_total,
-    "World Bank: armed forces % labor": wb_armed_forces_pct_labor,
+    "World Bank: mil exp %GDP": "data_sources:wb_milex_percent_gdp",
+    "World Bank: mil exp (USD)": "data_sources:wb_milex_current_usd",
+    "World Bank: armed forces total": "data_sources:wb_armed_forces_total",
+    "World Bank: armed forces % labor": "data_sources:wb_armed_forces_pct_labor",
 
     # UN & USAspending (existing)
-    "UN Peacekeeping: contributors": unpk_troop_contributors,
-    "USAspending: DoD obligations": usaspending_dod_obligations,
+    "UN Peacekeeping: contributors": "data_sources:unpk_troop_contributors",
+    "USAspending: DoD obligations": "data_sources:usaspending_dod_obligations",
 
     # OWID (new, optional)
-    "OWID: military personnel": owid_military_personnel,
-    "OWID: mil exp %GDP": owid_mil_exp_share_gdp,
+    "OWID: military personnel": "data_sources:owid_military_personnel",
+    "OWID: mil exp %GDP": "data_sources:owid_mil_exp_share_gdp",
     # You can add a NATO CSV/XLS source later when you find a stable structured link.
 }
 
+_RESOLVED: dict[str, object] = {}
+
+
+def _resolve(name: str):
+    """Resolve a REGISTRY entry's dotted path to its callable, memoized."""
+    fn = _RESOLVED.get(name)
+    if fn is None:
+        mod_name, attr = REGISTRY[name].split(":")
+        fn = getattr(importlib.import_module(mod_name), attr)
+        _RESOLVED[name] = fn
+    return fn
+
 
 def load_selected(sources: list[str]) -> pd.DataFrame:
+    sources = [s for s in (sources or []) if s in REGISTRY]
     frames = []
-    for name in sources or []:
-        fn = REGISTRY.get(name)
-        if not fn:
-            continue
-        try:
-            frames.append(fn())
-        except Exception:
-            # keep loading other sources
-            pass
-
+    if sources:
+        # every fetcher is HTTP-bound (GIL released during socket reads), so
+        # run them concurrently: wall time is max-of-latencies, not the sum
+        with ThreadPoolExecutor(max_workers=min(8, len(sources))) as ex:
+            futures = {ex.submit(_resolve(name)): name for name in sources}
+            for fut in as_completed(futures):
+                try:
+                    frames.append(fut.result())
+                except Exception:
+                    # keep loading other sources
+                    pass
+
+    # failed/empty sources return schema'd empty frames; drop them here —
+    # concat with empties is deprecated on pandas 2.x and under pandas 3
+    # their object columns would contaminate the merged dtypes
+    frames = [f for f in frames if not f.empty]
     if not frames:
         return pd.DataFrame(columns=["source", "country", "year", "metric", "value", "unit"])
 
-    df = pd.concat(frames, ignore_index=True)
-    df = df.dropna(subset=["value"])
-    if "year" in df.columns:
+    if len(frames) > 1:
+        # concat silently falls back to object dtype when category sets differ
+        # between frames, so union each label column's categories first
+        for col in _CATEGORY_COLS:
+            cats = union_categoricals([f[col] for f in frames]).categories
+            for f in frames:
+                f[col] = f[col].cat.set_categories(cats)
+
+    # Schemas/dtypes are aligned by _finalize, so concat is a cheap block stitch
+    df = pd.concat(frames, ignore_index=True, copy=False)
+    # Every fetcher already drops null values and coerces year, so only redo
+    # that O(N) cleanup if an unclean frame actually slipped through
+    if df["value"].isna().any():
+        df = df.dropna(subset=["value"])
+    if "year" in df.columns and not pd.api.types.is_integer_dtype(df["year"]):
         df["year"] = pd.to_numeric(df["year"], errors="coerce").astype("Int64")
     return df